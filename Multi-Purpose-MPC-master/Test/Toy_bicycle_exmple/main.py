@@ -4,6 +4,7 @@ from simulator import Simulator
 from mpc import MPC
 from model import simple_bycicle_model
 import do_mpc
+import logging
 import numpy as np
 import matplotlib.pyplot as plt
 from casadi import *
@@ -14,6 +15,10 @@ import time
 import globals
 sys.path.append('../../')
 
+# set to logging.INFO or logging.DEBUG to trace the control loop
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
 
 """ User settings: """
 show_animation = True
@@ -99,7 +104,7 @@ Run MPC main loop:
 k = 0
 while globals.s < reference_path.length:
     vehicle.get_current_waypoint()
-    print("======= wp_id ======== ", vehicle.wp_id)
+    logger.info("wp_id: %d", vehicle.wp_id)
     u0 = mpc.make_step(x0)
     x0 = simulator.make_step(u0)
     controller.distance_update(x0)
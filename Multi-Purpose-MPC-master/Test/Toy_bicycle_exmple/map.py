@@ -86,6 +86,11 @@ class Map:
         self.obstacles = list()
         self.boundaries = list()
 
+        # Centers and radii of all obstacles as arrays for vectorized checks
+        self.obs_cx = np.empty(0)
+        self.obs_cy = np.empty(0)
+        self.obs_r = np.empty(0)
+
     def w2m(self, x, y):
         """
         World2Map. Transform coordinates from global coordinate system to
@@ -133,6 +138,10 @@ class Map:
 
         # Extend list of obstacles
         self.obstacles.extend(obstacles)
+        self.obs_cx = np.array([obstacle.cx for obstacle in self.obstacles])
+        self.obs_cy = np.array([obstacle.cy for obstacle in self.obstacles])
+        self.obs_r = np.array(
+            [obstacle.radius for obstacle in self.obstacles])
 
         # Iterate over list of new obstacles
         for obstacle in obstacles:
@@ -148,6 +157,18 @@ class Map:
             self.data[cy_px-radius_px:cy_px+radius_px, cx_px-radius_px:
                       cx_px+radius_px][index] = 0
 
+    def any_hit(self, x, y, margin=0.0):
+        """
+        Check whether a point is within any obstacle.
+        :param x: x coordinate in global coordinate system
+        :param y: y coordinate in global coordinate system
+        :param margin: additional distance to keep from every obstacle in m
+        :return: True if the point is closer than radius + margin to the
+        center of an obstacle
+        """
+        return bool(np.any((x - self.obs_cx) ** 2 + (y - self.obs_cy) ** 2
+                           <= (self.obs_r + margin) ** 2))
+
     def add_boundary(self, boundaries):
         """
         Add boundaries to the map.
@@ -10,12 +10,46 @@ import sys
 import globals
 sys.path.append("../../")
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
 # Colors
 PREDICTION = '#BA4A00'
 CAR = '#F1C40F'
 CAR_OUTLINE = '#B7950B'
 
 
+@njit(cache=True)
+def _pick_waypoint(length_cum, s):
+    """
+    Index of the waypoint closest to the distance s traveled by the car.
+    """
+    # Get first index with distance larger than distance traveled by car
+    # so far (binary search)
+    next_wp_id = np.searchsorted(length_cum, s, side='right')
+    # Clamp to the last waypoint once s is beyond it, compiled code does
+    # not check array bounds
+    next_wp_id = min(next_wp_id, length_cum.shape[0] - 1)
+    # Get previous index
+    prev_wp_id = next_wp_id - 1
+
+    # Compare distance traveled for both enclosing waypoints (squared
+    # instead of absolute differences)
+    d_next = s - length_cum[next_wp_id]
+    d_prev = s - length_cum[prev_wp_id]
+    if d_next * d_next < d_prev * d_prev:
+        return next_wp_id
+    return prev_wp_id
+
+
+# Compile once at import instead of in the first control step
+_pick_waypoint(np.arange(2.0), 0.0)
+
+
 class simple_bycicle_model:
     def __init__(self, length, width, Ts, reference_path):
 
@@ -32,6 +66,9 @@ class simple_bycicle_model:
         self.wp_id = 0
         self.current_waypoint = self.reference_path.waypoints[self.wp_id]
 
+        # car drawn by show, moved in later frames
+        self.car_patch = None
+
         self.model_setup()
 
     def model_setup(self):
@@ -54,21 +91,25 @@ class simple_bycicle_model:
         ref_y = self.model.set_variable(var_type='_tvp', var_name='ref_y')
         ref_psi = self.model.set_variable(var_type='_tvp', var_name='ref_psi')
 
+        # subexpressions shared by the tracking errors and the dynamics, so
+        # the model graph contains them only once
+        yaw_rate = vel / self.length * delta
+        # heading error wrapped to [-pi, pi)
+        psi_cost = (fmod(psi - ref_psi + np.pi, 2 * np.pi) - np.pi)
+
         # tracking errors (optimization variables):
         #e_psi = psi - ref_psi + vel/self.length * (delta) * self.Ts
-        e_psi = (fmod(psi - ref_psi + np.pi, 2 * np.pi) - np.pi) + \
-            vel * delta / self.length * self.Ts
+        e_psi = psi_cost + yaw_rate * self.Ts
         e_y = pos_y - ref_y + vel * sin(e_psi) * self.Ts
 
         self.model.set_expression('e_psi', e_psi)
         self.model.set_expression('e_y', e_y)
 
-        psi_cost = (fmod(psi - ref_psi + np.pi, 2 * np.pi) - np.pi)
         self.model.set_expression('psi_cost', psi_cost)
 
         self.model.set_rhs('pos_x', vel * cos(psi))
         self.model.set_rhs('pos_y', vel * sin(psi))
-        self.model.set_rhs('psi', vel / self.length * (delta))
+        self.model.set_rhs('psi', yaw_rate)
         self.model.set_rhs('vel', acc)
 
         self.model.setup()
@@ -87,39 +128,37 @@ class simple_bycicle_model:
         Get closest waypoint on reference path based on car's current location.
         """
 
-        # Compute cumulative path length
-        length_cum = np.cumsum(self.reference_path.segment_lengths)
-        # Get first index with distance larger than distance traveled by car
-        # so far
-
-        greater_than_threshold = length_cum > globals.s
-        next_wp_id = greater_than_threshold.searchsorted(True)
-        # Get previous index
-        prev_wp_id = next_wp_id - 1
-
-        # Get distance traveled for both enclosing waypoints
-        s_next = length_cum[next_wp_id]
-        s_prev = length_cum[prev_wp_id]
-
-        if np.abs(globals.s - s_next) < np.abs(globals.s - s_prev):
-            self.wp_id = next_wp_id
-            self.current_waypoint = self.reference_path.waypoints[next_wp_id]
-        else:
-            self.wp_id = prev_wp_id
-            self.current_waypoint = self.reference_path.waypoints[prev_wp_id]
+        # Cumulative path length, computed once with the reference path
+        length_cum = self.reference_path.length_cum
+        # Distance traveled by car so far
+        s = float(np.asarray(globals.s).item())
+        self.wp_id = int(_pick_waypoint(length_cum, s))
+        self.current_waypoint = self.reference_path.waypoints[self.wp_id]
 
     def show(self, states):
         '''
         Display car on current axis.
         '''
-        x, y, psi = states[0], states[1], states[2]
+        x, y, psi = np.ravel(states)[:3]
 
-        # Get car's center of gravity
-        cog = (x, y)
+        # Shift center rectangle to match center of the car
+        cog = (
+            x - (self.length / 2 * np.cos(psi) - self.width / 2 * np.sin(psi)),
+            y - (self.width / 2 * np.cos(psi) + self.length / 2 * np.sin(psi)),
+        )
         # Get current angle with respect to x-axis
         yaw = np.rad2deg(psi)
+
+        # Move the rectangle drawn in the previous frame. Draw a new one if
+        # there is none on the current axis (e.g. the figure was cleared).
+        ax = plt.gca()
+        if self.car_patch is not None and self.car_patch.axes is ax:
+            self.car_patch.set_xy(cog)
+            self.car_patch.set_angle(yaw)
+            return
+
         # Draw rectangle
-        car = plt_patches.Rectangle(
+        self.car_patch = plt_patches.Rectangle(
             cog,
             width=self.length,
             height=self.width,
@@ -129,22 +168,5 @@ class simple_bycicle_model:
             zorder=20,
         )
 
-        # Shift center rectangle to match center of the car
-        car.set_x(
-            car.get_x()
-            - (
-                self.length / 2 * np.cos(psi)
-                - self.width / 2 * np.sin(psi)
-            )
-        )
-        car.set_y(
-            car.get_y()
-            - (
-                self.width / 2 * np.cos(psi)
-                + self.length / 2 * np.sin(psi)
-            )
-        )
-
         # Add rectangle to current axis
-        ax = plt.gca()
-        ax.add_patch(car)
+        ax.add_patch(self.car_patch)
@@ -1,4 +1,5 @@
 import do_mpc
+import logging
 import numpy as np
 from casadi import *
 from casadi.tools import *
@@ -9,11 +10,31 @@ import sys
 import globals
 sys.path.append("../../")
 
+logger = logging.getLogger(__name__)
+
 # Colors
 PREDICTION = '#BA4A00'
 CAR = '#F1C40F'
 CAR_OUTLINE = '#B7950B'
 
+_NEG_INF, _POS_INF = -np.inf, np.inf
+
+# State and input bounds
+BOUNDS = {
+    ('lower', '_x', 'pos_x'): _NEG_INF,
+    ('upper', '_x', 'pos_x'): _POS_INF,
+    ('lower', '_x', 'pos_y'): _NEG_INF,
+    ('upper', '_x', 'pos_y'): _POS_INF,
+    ('lower', '_x', 'psi'): - 2 * np.pi,
+    ('upper', '_x', 'psi'): 2 * np.pi,
+    ('lower', '_x', 'vel'): 0.0,
+    ('upper', '_x', 'vel'): 1.5,
+    ('lower', '_u', 'acc'): -0.1,
+    ('upper', '_u', 'acc'): 0.5,
+    ('lower', '_u', 'delta'): - 0.85,
+    ('upper', '_u', 'delta'): 0.85,
+}
+
 
 class MPC:
     def __init__(self, vehicle):
@@ -38,6 +59,14 @@ class MPC:
             't_step': self.Ts,
             'state_discretization': 'collocation',
             'store_full_solution': True,
+            # evaluate the NLP as SX instead of MX graph
+            'nlpsol_opts': {
+                'expand': True,
+                # no solver output at every step
+                'ipopt.print_level': 0,
+                'ipopt.sb': 'yes',
+                'print_time': False,
+            },
         }
         self.mpc.set_param(**setup_mpc)
 
@@ -58,7 +87,6 @@ class MPC:
             current_waypoint = self.vehicle.reference_path.get_waypoint(
                 self.vehicle.wp_id + k
             )
-            print("cwp: {}, {}".format(current_waypoint.x, current_waypoint.y))
             self.tvp_template['_tvp', k, 'ref_x'] = current_waypoint.x
             self.tvp_template['_tvp', k, 'ref_y'] = current_waypoint.y
             self.tvp_template['_tvp', k, 'ref_psi'] = current_waypoint.psi
@@ -81,21 +109,9 @@ class MPC:
 
     def constraints_setup(self, vel_bound=[0.0, 1.0], e_y_bound=[0.0, 1.0], reset=False):
 
-        # states constraints
-        self.mpc.bounds['lower', '_x', 'pos_x'] = -np.inf
-        self.mpc.bounds['upper', '_x', 'pos_x'] = np.inf
-        self.mpc.bounds['lower', '_x', 'pos_y'] = -np.inf
-        self.mpc.bounds['upper', '_x', 'pos_y'] = np.inf
-        self.mpc.bounds['lower', '_x', 'psi'] = - 2 * np.pi
-        self.mpc.bounds['upper', '_x', 'psi'] = 2 * np.pi
-        self.mpc.bounds['lower', '_x', 'vel'] = 0.0
-        self.mpc.bounds['upper', '_x', 'vel'] = 1.5
-
-        # input constraints
-        self.mpc.bounds['lower', '_u', 'acc'] = -0.1
-        self.mpc.bounds['upper', '_u', 'acc'] = 0.5
-        self.mpc.bounds['lower', '_u', 'delta'] = - 0.85
-        self.mpc.bounds['upper', '_u', 'delta'] = 0.85
+        # states and input constraints
+        for key, value in BOUNDS.items():
+            self.mpc.bounds[key] = value
 
         if reset is True:
             self.mpc.setup()
@@ -121,4 +137,4 @@ class MPC:
 
         # Update distance travelled along reference path
         globals.s += s_dot * self.Ts
-        print("traveled distance: ", globals.s)
+        logger.debug("traveled distance: %s", globals.s)
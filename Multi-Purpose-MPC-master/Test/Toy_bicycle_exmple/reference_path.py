@@ -116,9 +116,19 @@ class ReferencePath:
         # Length of path
         self.length, self.segment_lengths = self._compute_length()
 
+        # Cumulative path length at every waypoint
+        self.length_cum = np.ascontiguousarray(
+            np.cumsum(self.segment_lengths), dtype=np.float64)
+
         # Compute path width (attribute of each waypoint)
         self._compute_width(max_width=max_width)
 
+        # Axis the static map and path are drawn on by show and the artists
+        # moved in later frames
+        self.background_axis = None
+        self.waypoint_plot = None
+        self.constraint_plots = None
+
     def _construct_path(self, wp_x, wp_y):
         """
         Construct path from given waypoints.
@@ -384,7 +394,51 @@ class ReferencePath:
 
     def show(self, wp, display_drivable_area=True):
         """
-        Display path object on current figure.
+        Display path object on current figure. Map, path and obstacles are
+        drawn once, later calls only update the current waypoint and the
+        dynamic path constraints.
+        :param wp: current waypoint
+        :param display_drivable_area: If True, display arrows indicating width
+        of drivable area
+        """
+
+        # Get x and y locations of dynamic border cells for upper and lower
+        # bound
+        wp_ub_x = np.array(
+            [wp.dynamic_border_cells[0][0] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[0][0]])
+        wp_ub_y = np.array(
+            [wp.dynamic_border_cells[0][1] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[0][1]])
+        wp_lb_x = np.array(
+            [wp.dynamic_border_cells[1][0] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[1][0]])
+        wp_lb_y = np.array(
+            [wp.dynamic_border_cells[1][1] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[1][1]])
+
+        # Update the artists of the previous frame if the background is
+        # still on the current axis
+        if self.background_axis is plt.gca():
+            self.waypoint_plot.set_data([wp.x], [wp.y])
+            self.constraint_plots[0].set_data(wp_ub_x, wp_ub_y)
+            self.constraint_plots[1].set_data(wp_lb_x, wp_lb_y)
+            return
+
+        self._show_background(display_drivable_area)
+
+        # Plot current waypoint
+        self.waypoint_plot = plt.plot(wp.x, wp.y, 'ro')[0]
+
+        # Plot dynamic path constraints
+        self.constraint_plots = (
+            plt.plot(wp_ub_x, wp_ub_y, c=PATH_CONSTRAINTS)[0],
+            plt.plot(wp_lb_x, wp_lb_y, c=PATH_CONSTRAINTS)[0],
+        )
+
+    def _show_background(self, display_drivable_area):
+        """
+        Clear figure and draw map, path and obstacles.
         :param display_drivable_area: If True, display arrows indicating width
         of drivable area
         """
@@ -424,8 +478,6 @@ class ReferencePath:
         # colors = [wp.v_ref for wp in self.waypoints]
         plt.scatter(wp_x, wp_y, c=WAYPOINTS, s=10)
 
-        plt.plot(wp.x, wp.y, 'ro')
-
         # Plot arrows indicating drivable area
         if display_drivable_area:
             plt.quiver(wp_x, wp_y, wp_ub_x - wp_x, wp_ub_y - wp_y, scale=1,
@@ -461,27 +513,12 @@ class ReferencePath:
                      (bl_y[-2], br_y[-2]), color=OBSTACLE)
             plt.plot((bl_x[0], br_x[0]), (bl_y[0], br_y[0]), color=OBSTACLE)
 
-        # Plot dynamic path constraints
-        # Get x and y locations of border cells for upper and lower bound
-        wp_ub_x = np.array(
-            [wp.dynamic_border_cells[0][0] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[0][0]])
-        wp_ub_y = np.array(
-            [wp.dynamic_border_cells[0][1] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[0][1]])
-        wp_lb_x = np.array(
-            [wp.dynamic_border_cells[1][0] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[1][0]])
-        wp_lb_y = np.array(
-            [wp.dynamic_border_cells[1][1] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[1][1]])
-        plt.plot(wp_ub_x, wp_ub_y, c=PATH_CONSTRAINTS)
-        plt.plot(wp_lb_x, wp_lb_y, c=PATH_CONSTRAINTS)
-
         # Plot obstacles
         for obstacle in self.map.obstacles:
             obstacle.show()
 
+        self.background_axis = plt.gca()
+
     def _compute_free_segments(self, wp, min_width):
         """
         Compute free path segments.
@@ -7,12 +7,40 @@ import matplotlib.patches as plt_patches
 import pdb
 import sys
 import globals
+from solver import FatropSolver, JIT_OPTS, SQP_OPTS
 
 sys.path.append('../../')
 
+# warm-start IPOPT from the shifted solution (primal and multipliers) of the
+# previous step, only used once a previous solution exists. The references
+# move every step, so the barrier parameter restarts moderately small.
+IPOPT_WARM_START_OPTS = {
+    'ipopt.warm_start_init_point': 'yes',
+    'ipopt.mu_init': 1e-4,
+}
+
+_NEG_INF, _POS_INF = -np.inf, np.inf
+
+# constant state and input bounds, the velocity bounds are set per call
+BOUNDS = {
+    ('lower', '_x', 'pos_x'): _NEG_INF,
+    ('upper', '_x', 'pos_x'): _POS_INF,
+    ('lower', '_x', 'pos_y'): _NEG_INF,
+    ('upper', '_x', 'pos_y'): _POS_INF,
+    ('lower', '_x', 'psi'): - 2 * np.pi,
+    ('upper', '_x', 'psi'): 2 * np.pi,
+    ('lower', '_x', 'e_y'): -2.0,
+    ('upper', '_x', 'e_y'): 2.0,
+    ('lower', '_u', 'acc'): -0.5,
+    ('upper', '_u', 'acc'): 0.5,
+    ('lower', '_u', 'delta'): -1.0,
+    ('upper', '_u', 'delta'): 1.0,
+}
+
 
 class MPC:
-    def __init__(self, vehicle):
+    def __init__(self, vehicle, nlp_solver='fatrop', jit=False,
+                 adaptive_horizon=False):
 
         self.vehicle = vehicle
         self.model = vehicle.model
@@ -26,6 +54,29 @@ class MPC:
 
         self.current_prediction = None
 
+        # shorten the horizon by 2 stages (down to min_horizon) whenever the
+        # solver needed at most iter_threshold iterations for n_easy_steps
+        # consecutive steps. Every change rebuilds the NLP (seconds).
+        self.adaptive_horizon = adaptive_horizon
+        self.min_horizon = 10
+        self.iter_threshold = 15
+        self.n_easy_steps = 5
+        self.easy_steps = 0
+
+        # solver: 'fatrop', 'sqpmethod' or do-mpc's default 'ipopt'
+        if nlp_solver == 'fatrop' and not has_nlpsol('fatrop'):
+            nlp_solver = 'ipopt'
+        self.nlp_solver = nlp_solver
+        self.jit_opts = JIT_OPTS if jit else {}
+
+        self._setup_mpc()
+
+    def _setup_mpc(self):
+        '''
+        builds the do-mpc controller for the current horizon
+        '''
+        nlp_solver, jit_opts = self.nlp_solver, self.jit_opts
+
         self.mpc = do_mpc.controller.MPC(self.model)
         setup_mpc = {
             'n_robust': 0,
@@ -33,39 +84,131 @@ class MPC:
             't_step': self.Ts,
             'state_discretization': 'collocation',
             'store_full_solution': True,
+            # The Hessian stays exact: only the cost is quadratic, the
+            # collocation constraints of the bicycle model are not, and a
+            # limited-memory (BFGS) approximation needs far more iterations
+            'nlpsol_opts': {
+                # evaluate the NLP as SX instead of MX graph
+                'expand': True,
+                # no solver output at every step
+                'ipopt.print_level': 0,
+                'ipopt.sb': 'yes',
+                'print_time': False,
+            },
         }
+        if nlp_solver == 'ipopt':
+            setup_mpc['nlpsol_opts'].update(jit_opts)
         self.mpc.set_param(**setup_mpc)
 
         # define the objective function and constriants
         self.objective_function_setup()
         self.constraints_setup()
 
-        # provide time-varing parameters: setpoints/references
+        # provide time-varing parameters: setpoints/references, filled into
+        # a buffer (one row per stage, one column per parameter) before
+        # every step
         self.tvp_template = self.mpc.get_tvp_template()
+        self.tvp_names = [
+            name for name in self.model.tvp.keys() if name != 'default']
+        self._tvp_buf = np.zeros((self.horizon + 1, len(self.tvp_names)))
         self.mpc.set_tvp_fun(self.tvp_fun)
 
         self.mpc.setup()
 
+        # the first step is solved cold by do-mpc's IPOPT solver, all later
+        # steps by a solver warm-started from the previous solution
+        self.warm_solver = None
+        if nlp_solver == 'ipopt':
+            self.warm_solver = nlpsol(
+                'S', 'ipopt', self.mpc.nlp,
+                dict(self.mpc.settings.nlpsol_opts, **IPOPT_WARM_START_OPTS))
+
+        # replace IPOPT by the structure-exploiting fatrop or by an SQP
+        # method solving the QP subproblems with qrqp
+        if nlp_solver == 'fatrop':
+            self.mpc.S = FatropSolver(self.mpc, self.horizon, jit_opts)
+        elif nlp_solver == 'sqpmethod':
+            self.mpc.S = nlpsol('S', 'sqpmethod', self.mpc.nlp,
+                                dict(SQP_OPTS, **jit_opts))
+
+        # index maps shifting the horizon solution and the constraint
+        # multipliers by one stage
+        self.shift_idx = self._compute_shift_index()
+        self.g_shift_idx = self._compute_constraint_shift_index()
+
+    def _shorten_horizon(self, x0):
+        '''
+        rebuilds the controller with a horizon shorter by 2 stages, the new
+        solver starts from the current state
+        '''
+        self.horizon = max(self.min_horizon, self.horizon - 2)
+        globals.horizon = self.horizon
+        self.easy_steps = 0
+
+        self._setup_mpc()
+        self.mpc.x0 = x0
+        self.mpc.set_initial_guess()
+
+    def _compute_shift_index(self):
+        '''
+        maps every entry of the optimization vector to the entry of the next
+        stage, the final stage is duplicated: x_{N-1|t} = x_{N|t}
+        '''
+        opt_x = self.mpc.opt_x
+        shift_idx = np.arange(opt_x.shape[0])
+        for var, n_stages in (('_x', self.horizon + 1), ('_u', self.horizon)):
+            for k in range(n_stages - 1):
+                shift_idx[opt_x.f[var, k]] = opt_x.f[var, k + 1]
+
+        return shift_idx
+
+    def _compute_constraint_shift_index(self):
+        '''
+        maps every constraint to the same constraint of the next stage, the
+        initial condition and the final stage are kept. The constraints are
+        the initial condition, then per stage the collocation equations and
+        the continuity constraints.
+        '''
+        n_x = self.model.n_x
+        n_g = self.mpc.nlp['g'].shape[0]
+        n_stage_g = len(self.mpc.opt_x.f['_x', 1, 0, :-1]) + n_x
+        assert n_g == n_x + self.horizon * n_stage_g, \
+            'unexpected number of constraints (nonlinear constraints?)'
+
+        g_shift_idx = np.arange(n_g)
+        g_shift_idx[n_x:n_g - n_stage_g] += n_stage_g
+
+        return g_shift_idx
+
+    def update_tvp(self):
+        '''
+        fills the references and bounds of all stages, including the
+        terminal stage, into the tvp buffer
+        '''
+        ey_ub, ey_lb, _ = self.update_new_bound()
+
+        reference_path = self.vehicle.reference_path
+        wp_ids = reference_path.get_waypoint_ids(
+            self.vehicle.wp_id, self.horizon + 1)
+
+        columns = {
+            'x_ref': reference_path.wp_x,
+            'y_ref': reference_path.wp_y,
+            'psi_ref': reference_path.wp_psi,
+            'vel_ref': reference_path.wp_vref,
+        }
+        for i, name in enumerate(self.tvp_names):
+            if name in columns:
+                self._tvp_buf[:, i] = columns[name][wp_ids]
+        self._tvp_buf[:, self.tvp_names.index('ey_lb')] = ey_lb
+        self._tvp_buf[:, self.tvp_names.index('ey_ub')] = ey_ub
+
     def tvp_fun(self, t_now):
         '''
         provides data into time-varying parameters 
         '''
-        ey_ub, ey_lb, _ = self.update_new_bound()
-        for k in range(self.horizon):
-            # extract information from current waypoint
-            current_waypoint = self.vehicle.reference_path.get_waypoint(
-                self.vehicle.wp_id + k
-            )
-            self.tvp_template['_tvp', k, 'x_ref'] = current_waypoint.x
-            self.tvp_template['_tvp', k, 'y_ref'] = current_waypoint.y
-            self.tvp_template['_tvp', k, 'psi_ref'] = current_waypoint.psi
-            self.tvp_template['_tvp', k, 'ey_lb'] = ey_lb[k]
-            self.tvp_template['_tvp', k, 'ey_ub'] = ey_ub[k]
-            if current_waypoint.v_ref is not None:
-                self.tvp_template['_tvp', k,
-                                  'vel_ref'] = current_waypoint.v_ref
-            else:
-                self.tvp_template['_tvp', k, 'vel_ref'] = 0
+        # the template is ordered by stage, then by parameter
+        self.tvp_template.master = DM(self._tvp_buf.reshape(-1, 1))
 
         return self.tvp_template
 
@@ -94,23 +237,11 @@ class MPC:
         self, vel_bound=[0.0, 1.0], reset=False
     ):
 
-        # states constraints
-        self.mpc.bounds['lower', '_x', 'pos_x'] = -np.inf
-        self.mpc.bounds['upper', '_x', 'pos_x'] = np.inf
-        self.mpc.bounds['lower', '_x', 'pos_y'] = -np.inf
-        self.mpc.bounds['upper', '_x', 'pos_y'] = np.inf
-        self.mpc.bounds['lower', '_x', 'psi'] = - 2 * np.pi
-        self.mpc.bounds['upper', '_x', 'psi'] = 2 * np.pi
+        # states and input constraints
+        for key, value in BOUNDS.items():
+            self.mpc.bounds[key] = value
         self.mpc.bounds['lower', '_x', 'vel'] = vel_bound[0]
         self.mpc.bounds['upper', '_x', 'vel'] = vel_bound[1]
-        self.mpc.bounds['lower', '_x', 'e_y'] = -2
-        self.mpc.bounds['upper', '_x', 'e_y'] = 2
-
-        # input constraints
-        self.mpc.bounds['lower', '_u', 'acc'] = -0.5
-        self.mpc.bounds['upper', '_u', 'acc'] = 0.5
-        self.mpc.bounds['lower', '_u', 'delta'] = -1
-        self.mpc.bounds['upper', '_u', 'delta'] = 1
 
         if reset is True:
             self.mpc.setup()
@@ -119,7 +250,7 @@ class MPC:
         # Compute dynamic constraints on e_y
         ey_ub, ey_lb, _ = self.vehicle.reference_path.update_path_constraints(
             self.vehicle.wp_id + 1,
-            globals.horizon,
+            globals.horizon + 1,
             2 * self.vehicle.safety_margin,
             self.vehicle.safety_margin,
         )
@@ -135,12 +266,33 @@ class MPC:
 
     def get_control(self, x0):
 
-        # update current waypoint
+        # rebuild before the step, so the data of the last step stays
+        # available until then
+        if self.easy_steps >= self.n_easy_steps:
+            self._shorten_horizon(x0)
+
+        # update current waypoint and the references along the horizon
         self.vehicle.get_current_waypoint()
+        self.update_tvp()
 
         # solve optization problem
         u0 = self.mpc.make_step(x0)
 
+        # shift the solution and the multipliers to serve as initial guess
+        # of the next step
+        self.mpc.opt_x_num.master = self.mpc.opt_x_num.master[self.shift_idx]
+        self.mpc.lam_x_num = self.mpc.lam_x_num[self.shift_idx]
+        self.mpc.lam_g_num = self.mpc.lam_g_num[self.g_shift_idx]
+        if self.warm_solver is not None:
+            self.mpc.S = self.warm_solver
+
+        # count the consecutive steps solved in few iterations
+        if self.adaptive_horizon and self.horizon > self.min_horizon:
+            if self.mpc.solver_stats['iter_count'] <= self.iter_threshold:
+                self.easy_steps += 1
+            else:
+                self.easy_steps = 0
+
         return np.array([u0[0], u0[1]])
 
     def distance_update(self, states):
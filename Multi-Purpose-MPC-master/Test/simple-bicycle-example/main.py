@@ -1,5 +1,7 @@
 import pdb
+import queue
 import sys
+import threading
 import time
 import do_mpc
 import numpy as np
@@ -87,6 +89,75 @@ def MPC_Problem_setup(reference_path, ay_max=4.0, a_min=-1, a_max=1):
     return Vehicle, Controller, Sim
 
 
+def control_loop(reference_path, Controller, Sim, x0, snapshots=None,
+                 errors=None):
+    '''
+    Run the closed loop until arrival at the end of the path. If a queue is
+    given, a snapshot (state, predicted x, predicted y) of every step is put
+    into it for rendering, followed by None once the loop has finished or
+    failed. If a list is given, an exception raised in the loop (including
+    SystemExit) is appended to it instead of being raised, so the thread
+    that started the loop can re-raise it.
+    '''
+    try:
+        while globals.s < reference_path.length:
+            # Get control signals
+            u = Controller.get_control(x0)
+
+            # Simulate car
+            x0 = Sim.simulator.make_step(u)
+            Controller.distance_update(x0)
+
+            if snapshots is not None:
+                pred_x = Controller.mpc.data.prediction(('_x', 'pos_x'))[0]
+                pred_y = Controller.mpc.data.prediction(('_x', 'pos_y'))[0]
+
+                # Only keep the latest snapshot, the renderer skips stale
+                # frames
+                try:
+                    snapshots.get_nowait()
+                except queue.Empty:
+                    pass
+                snapshots.put_nowait((np.ravel(x0).copy(), pred_x, pred_y))
+
+            # update boundary for the next iteration
+            Controller.constraints_setup()
+
+    except BaseException as error:
+        if errors is None:
+            raise
+        errors.append(error)
+
+    finally:
+        # always stop the renderer
+        if snapshots is not None:
+            snapshots.put(None)
+
+
+def render_loop(reference_path, Sim, snapshots, render_period=0.03):
+    '''
+    Draw the snapshots of the control loop at a bounded rate. Has to run in
+    the main thread since matplotlib is not thread-safe.
+    '''
+    while True:
+        try:
+            snapshot = snapshots.get_nowait()
+        except queue.Empty:
+            # Keep the figure responsive while the controller is busy
+            plt.pause(render_period)
+            continue
+        if snapshot is None:
+            break
+
+        # Plot path and drivable area/ plot car
+        x0, pred_x, pred_y = snapshot
+        reference_path.show(pred_x, pred_y)
+        Sim.show(x0)
+
+        plt.axis('off')
+        plt.pause(render_period)
+
+
 if __name__ == '__main__':
 
     ''' User settings: '''
@@ -115,27 +186,22 @@ if __name__ == '__main__':
     '''
     Run MPC main loop:
     '''
-    # Until arrival at end of path
-    t = 0
-    while globals.s < reference_path.length:
-        # Get control signals
-        u = Controller.get_control(x0)
-
-        # Simulate car
-        x0 = Sim.simulator.make_step(u)
-        Controller.distance_update(x0)
-
-        # Plot path and drivable area/ plot car
-        pred_x = Controller.mpc.data.prediction(('_x', 'pos_x'), t_ind=t)[0]
-        pred_y = Controller.mpc.data.prediction(('_x', 'pos_y'), t_ind=t)[0]
-        reference_path.show(pred_x, pred_y)
-        Sim.show(x0)
-
-        # update boundary for the next iteration
-        Controller.constraints_setup()
-
-        t += 1
-        plt.axis('off')
-        plt.pause(0.001)
+    # Until arrival at end of path. The controller runs in its own thread,
+    # so drawing does not slow down the control loop.
+    snapshots = queue.Queue(maxsize=1) if show_animation else None
+    errors = []
+    controller_thread = threading.Thread(
+        target=control_loop,
+        args=(reference_path, Controller, Sim, x0, snapshots, errors),
+        daemon=True,
+    )
+    controller_thread.start()
+    if show_animation:
+        render_loop(reference_path, Sim, snapshots)
+    controller_thread.join()
+
+    # Exceptions in the control thread do not end the process, re-raise them
+    if errors:
+        raise errors[0]
 
     input('Press any key to exit.')
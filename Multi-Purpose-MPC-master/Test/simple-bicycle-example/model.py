@@ -13,6 +13,36 @@ from reference_path import ReferencePath
 
 sys.path.append("../../")
 
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
+@njit(cache=True)
+def _pick_waypoint(length_cum, s):
+    '''
+    index of the waypoint closest to the traveled distance s
+    '''
+    # binary search for the first waypoint beyond the traveled distance
+    next_wp_id = np.searchsorted(length_cum, s, side='right')
+    # clamp to the last waypoint once s is beyond it, compiled code does
+    # not check array bounds
+    next_wp_id = min(next_wp_id, length_cum.shape[0] - 1)
+
+    # dervie the distance traveled of two id points
+    prev_wp_id = next_wp_id - 1
+    d_next = s - length_cum[next_wp_id]
+    d_prev = s - length_cum[prev_wp_id]
+    if d_next * d_next < d_prev * d_prev:
+        return next_wp_id
+    return prev_wp_id
+
+
+# compile once at import instead of in the first control step
+_pick_waypoint(np.arange(2.0), 0.0)
+
 
 class simple_bycicle_model:
     def __init__(self, reference_path, length, width, Ts):
@@ -75,20 +105,9 @@ class simple_bycicle_model:
 
     def get_current_waypoint(self):
 
-        # Compute the sum of the path length
-        sum_length = np.cumsum(self.reference_path.segment_lengths)
-
-        find_greater_value = sum_length > globals.s
-        next_wp_id = find_greater_value.searchsorted(True)
+        # Cumulative path length, computed once with the reference path
+        sum_length = self.reference_path.length_cum
 
-        # dervie the distance traveled of two id points
-        prev_wp_id = next_wp_id - 1
-        s_next = sum_length[next_wp_id]
-        s_prev = sum_length[prev_wp_id]
-
-        if np.abs(globals.s - s_next) < np.abs(globals.s - s_prev):
-            self.wp_id = next_wp_id
-            self.current_waypoint = self.reference_path.waypoints[next_wp_id]
-        else:
-            self.wp_id = prev_wp_id
-            self.current_waypoint = self.reference_path.waypoints[prev_wp_id]
+        s = float(np.asarray(globals.s).item())
+        self.wp_id = int(_pick_waypoint(sum_length, s))
+        self.current_waypoint = self.reference_path.waypoints[self.wp_id]
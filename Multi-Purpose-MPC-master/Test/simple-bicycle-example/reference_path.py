@@ -113,12 +113,32 @@ class ReferencePath:
         # Number of waypoints
         self.n_waypoints = len(self.waypoints)
 
+        # Waypoint coordinates, orientation and reference velocity as
+        # contiguous arrays for slicing over the prediction horizon
+        self.wp_x = np.ascontiguousarray(
+            [wp.x for wp in self.waypoints], dtype=np.float64)
+        self.wp_y = np.ascontiguousarray(
+            [wp.y for wp in self.waypoints], dtype=np.float64)
+        self.wp_psi = np.ascontiguousarray(
+            [wp.psi for wp in self.waypoints], dtype=np.float64)
+        self.wp_vref = np.zeros(self.n_waypoints)
+
         # Length of path
         self.length, self.segment_lengths = self._compute_length()
 
+        # Cumulative path length at every waypoint
+        self.length_cum = np.ascontiguousarray(
+            np.cumsum(self.segment_lengths), dtype=np.float64)
+
         # Compute path width (attribute of each waypoint)
         self._compute_width(max_width=max_width)
 
+        # Axis the static map and path are drawn on by show and the artists
+        # moved in later frames
+        self.background_axis = None
+        self.prediction_plot = None
+        self.constraint_plots = None
+
     def _construct_path(self, wp_x, wp_y):
         """
         Construct path from given waypoints.
@@ -364,6 +384,8 @@ class ReferencePath:
         for i, wp in enumerate(self.waypoints[:-1]):
             wp.v_ref = speed_profile[i]
         self.waypoints[-1].v_ref = self.waypoints[-2].v_ref
+        self.wp_vref[:-1] = speed_profile
+        self.wp_vref[-1] = self.wp_vref[-2]
 
     def get_waypoint(self, wp_id):
         """
@@ -382,9 +404,75 @@ class ReferencePath:
 
         return self.waypoints[wp_id]
 
+    def get_waypoint_ids(self, wp_id, N):
+        """
+        Get the IDs of N consecutive waypoints starting at wp_id. Circular
+        indexing supported.
+        :param wp_id: unique waypoint ID of the first waypoint
+        :param N: number of waypoints
+        :return: array of waypoint IDs to index the waypoint arrays with
+        """
+
+        wp_ids = np.arange(wp_id, wp_id + N)
+
+        # Allow circular indexing if circular path
+        if self.circular:
+            wp_ids = np.mod(wp_ids, self.n_waypoints)
+        # Terminate execution if end of path reached
+        elif wp_ids[-1] >= self.n_waypoints:
+            print('Reached end of path!')
+            exit(1)
+
+        return wp_ids
+
     def show(self, pred_x, pred_y, display_drivable_area=True):
         """
-        Display path object on current figure.
+        Display path object on current figure. Map, path and obstacles are
+        drawn once, later calls only update the predicted positions and the
+        dynamic path constraints.
+        :param pred_x: x coordinates of the predicted positions
+        :param pred_y: y coordinates of the predicted positions
+        :param display_drivable_area: If True, display arrows indicating width
+        of drivable area
+        """
+
+        # Get x and y locations of dynamic border cells for upper and lower
+        # bound
+        wp_ub_x = np.array(
+            [wp.dynamic_border_cells[0][0] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[0][0]])
+        wp_ub_y = np.array(
+            [wp.dynamic_border_cells[0][1] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[0][1]])
+        wp_lb_x = np.array(
+            [wp.dynamic_border_cells[1][0] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[1][0]])
+        wp_lb_y = np.array(
+            [wp.dynamic_border_cells[1][1] for wp in self.waypoints] +
+            [self.waypoints[0].static_border_cells[1][1]])
+
+        # Update the artists of the previous frame if the background is
+        # still on the current axis
+        if self.background_axis is plt.gca():
+            self.prediction_plot.set_offsets(np.column_stack((pred_x, pred_y)))
+            self.constraint_plots[0].set_data(wp_ub_x, wp_ub_y)
+            self.constraint_plots[1].set_data(wp_lb_x, wp_lb_y)
+            return
+
+        self._show_background(display_drivable_area)
+
+        # Plot predicted positions
+        self.prediction_plot = plt.scatter(pred_x, pred_y, c=PREDICTION, s=15)
+
+        # Plot dynamic path constraints
+        self.constraint_plots = (
+            plt.plot(wp_ub_x, wp_ub_y, c=PATH_CONSTRAINTS)[0],
+            plt.plot(wp_lb_x, wp_lb_y, c=PATH_CONSTRAINTS)[0],
+        )
+
+    def _show_background(self, display_drivable_area):
+        """
+        Clear figure and draw map, path and obstacles.
         :param display_drivable_area: If True, display arrows indicating width
         of drivable area
         """
@@ -423,7 +511,6 @@ class ReferencePath:
         # Plot waypoints
         # colors = [wp.v_ref for wp in self.waypoints]
         plt.scatter(wp_x, wp_y, c=WAYPOINTS, s=10)
-        plt.scatter(pred_x, pred_y, c=PREDICTION, s=15)
 
         # Plot arrows indicating drivable area
         if display_drivable_area:
@@ -460,27 +547,12 @@ class ReferencePath:
                      (bl_y[-2], br_y[-2]), color=OBSTACLE)
             plt.plot((bl_x[0], br_x[0]), (bl_y[0], br_y[0]), color=OBSTACLE)
 
-        # Plot dynamic path constraints
-        # Get x and y locations of border cells for upper and lower bound
-        wp_ub_x = np.array(
-            [wp.dynamic_border_cells[0][0] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[0][0]])
-        wp_ub_y = np.array(
-            [wp.dynamic_border_cells[0][1] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[0][1]])
-        wp_lb_x = np.array(
-            [wp.dynamic_border_cells[1][0] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[1][0]])
-        wp_lb_y = np.array(
-            [wp.dynamic_border_cells[1][1] for wp in self.waypoints] +
-            [self.waypoints[0].static_border_cells[1][1]])
-        plt.plot(wp_ub_x, wp_ub_y, c=PATH_CONSTRAINTS)
-        plt.plot(wp_lb_x, wp_lb_y, c=PATH_CONSTRAINTS)
-
         # Plot obstacles
         for obstacle in self.map.obstacles:
             obstacle.show()
 
+        self.background_axis = plt.gca()
+
     def _compute_free_segments(self, wp, min_width):
         """
         Compute free path segments.
@@ -28,6 +28,9 @@ class Simulator:
 
         self.simulator.setup()
 
+        # car drawn by show, moved in later frames
+        self.car_patch = None
+
     def tvp_fun(self, t_now):
         # extract information from current waypoint
         current_waypoint = self.vehicle.reference_path.get_waypoint(
@@ -54,39 +57,35 @@ class Simulator:
         '''
         Display car on current axis.
         '''
-        x, y, psi = states[0], states[1], states[2]
+        x, y, psi = np.ravel(states)[:3]
+        length, width = self.vehicle.length, self.vehicle.width
 
-        # Get car's center of gravity
-        cog = (x, y)
+        # Shift center rectangle to match center of the car
+        cog = (
+            x - (length / 2 * np.cos(psi) - width / 2 * np.sin(psi)),
+            y - (width / 2 * np.cos(psi) + length / 2 * np.sin(psi)),
+        )
         # Get current angle with respect to x-axis
         yaw = np.rad2deg(psi)
+
+        # Move the rectangle drawn in the previous frame. Draw a new one if
+        # there is none on the current axis (e.g. the figure was cleared).
+        ax = plt.gca()
+        if self.car_patch is not None and self.car_patch.axes is ax:
+            self.car_patch.set_xy(cog)
+            self.car_patch.set_angle(yaw)
+            return
+
         # Draw rectangle
-        car = plt_patches.Rectangle(
+        self.car_patch = plt_patches.Rectangle(
             cog,
-            width=self.vehicle.length,
-            height=self.vehicle.width,
+            width=length,
+            height=width,
             angle=yaw,
             facecolor=CAR,
             edgecolor=CAR_OUTLINE,
             zorder=20,
         )
 
-        # Shift center rectangle to match center of the car
-        car.set_x(
-            car.get_x()
-            - (
-                self.vehicle.length / 2 * np.cos(psi)
-                - self.vehicle.width / 2 * np.sin(psi)
-            )
-        )
-        car.set_y(
-            car.get_y()
-            - (
-                self.vehicle.width / 2 * np.cos(psi)
-                + self.vehicle.length / 2 * np.sin(psi)
-            )
-        )
-
         # Add rectangle to current axis
-        ax = plt.gca()
-        ax.add_patch(car)
+        ax.add_patch(self.car_patch)
@@ -0,0 +1,161 @@
+import numpy as np
+from casadi import *
+
+# generate C code for the NLP functions (objective, constraints and their
+# derivatives) and compile it instead of evaluating them in the casadi
+# virtual machine
+JIT_OPTS = {
+    'jit': True,
+    'compiler': 'shell',
+    'jit_options': {'flags': ['-O3', '-march=native'], 'verbose': False},
+}
+
+# SQP with casadi's active-set QP solver qrqp. Its multipliers are exact, so
+# the dual infeasibility of the SQP iterates goes to zero (with OSQP's
+# approximate duals most steps ended at max_iter). The Lagrangian Hessian is
+# clipped to be positive definite since qrqp only solves convex QPs. tol_du
+# is set against the scale of the cost, whose gradient is of order 1e4. A QP
+# failing in one iteration does not abort the step, whether the step
+# converged is reported in the return status of the solver stats.
+SQP_OPTS = {
+    'qpsol': 'qrqp',
+    'qpsol_options': {
+        'error_on_fail': False,
+        'print_iter': False,
+        'print_header': False,
+        'print_info': False,
+    },
+    'max_iter': 100,
+    'tol_pr': 1e-6,
+    'tol_du': 1e-3,
+    'convexify_strategy': 'eigen-clip',
+    'expand': True,
+    'print_time': False,
+    'print_header': False,
+    'print_iteration': False,
+    'print_status': False,
+}
+
+
+class FatropSolver:
+    '''
+    Drop-in replacement for the IPOPT solver object of a do-mpc controller
+    using the structure-exploiting solver fatrop.
+
+    fatrop requires the decision vector ordered stage by stage
+    (x_0, u_0, x_1, u_1, ..., x_N) and the gap-closing constraints written as
+    x_{k+1} - F(x_k, u_k). do-mpc orders the NLP by variable type, so the
+    problem is permuted once here and every solver call is mapped forth and
+    back. The collocation points of a stage are treated as controls.
+    Assumes n_robust = 0 and no nonlinear constraints.
+    '''
+
+    def __init__(self, mpc, n_horizon, opts=None):
+
+        assert mpc.settings.n_robust == 0, 'fatrop requires n_robust = 0'
+
+        opt_x = mpc.opt_x
+        n_x = mpc.model.n_x
+        n_g = mpc.nlp['g'].shape[0]
+
+        # decision vector: x_k, then u_k together with the collocation points
+        # of stage k (stage 0 also holds the unused initial collocation points)
+        x_perm = list(opt_x.f['_x', 0, 0, -1]) + list(opt_x.f['_x', 0, 0, :-1])
+        nu = [len(x_perm) - n_x]
+        for k in range(n_horizon):
+            if k > 0:
+                x_perm += list(opt_x.f['_x', k, 0, -1])
+                nu.append(0)
+            stage_u = list(opt_x.f['_u', k, 0]) + \
+                list(opt_x.f['_x', k + 1, 0, :-1])
+            x_perm += stage_u
+            nu[k] += len(stage_u)
+        x_perm += list(opt_x.f['_x', n_horizon, 0, -1])
+        nu.append(0)
+
+        # constraints: initial condition, then for every stage the collocation
+        # equations followed by the continuity constraints
+        n_coll_g = len(opt_x.f['_x', 1, 0, :-1])
+        n_stage_g = n_coll_g + n_x
+        assert n_g == n_x + n_horizon * n_stage_g, \
+            'unexpected number of constraints (nonlinear constraints?)'
+        g_perm, g_sign = [], []
+        for k in range(n_horizon):
+            offset = n_x + k * n_stage_g
+            g_perm += list(range(offset + n_coll_g, offset + n_stage_g))
+            g_sign += [-1] * n_x
+            if k == 0:
+                g_perm += list(range(n_x))
+                g_sign += [1] * n_x
+            g_perm += list(range(offset, offset + n_coll_g))
+            g_sign += [1] * n_coll_g
+        ng = [n_x + n_coll_g] + [n_coll_g] * (n_horizon - 1) + [0]
+
+        self.x_perm = np.array(x_perm)
+        self.x_inv = np.argsort(self.x_perm)
+        self.g_perm = np.array(g_perm)
+        self.g_inv = np.argsort(self.g_perm)
+        self.g_sign = np.array(g_sign, dtype=float)
+
+        lbg = self._vec(mpc.nlp_cons_lb)[self.g_perm]
+        ubg = self._vec(mpc.nlp_cons_ub)[self.g_perm]
+
+        x = vertcat(mpc.opt_x)
+        nlp = {
+            'x': x[x_perm],
+            'f': mpc.nlp['f'],
+            'g': mpc.nlp['g'][g_perm] * DM(self.g_sign),
+            'p': mpc.nlp['p'],
+        }
+        fatrop_opts = {
+            'structure_detection': 'manual',
+            'N': n_horizon,
+            'nx': [n_x] * (n_horizon + 1),
+            'nu': nu,
+            'ng': ng,
+            'equality': (lbg == ubg).tolist(),
+            'expand': True,
+            'print_time': False,
+            'fatrop': {'print_level': 0},
+        }
+        if opts is not None:
+            fatrop_opts.update(opts)
+        self.solver = nlpsol('S', 'fatrop', nlp, fatrop_opts)
+
+    @staticmethod
+    def _vec(value):
+        if hasattr(value, 'cat'):
+            value = value.cat
+        return np.ravel(DM(value).full())
+
+    def __call__(self, x0, lbx, ubx, lbg, ubg, p, lam_x0=None, lam_g0=None):
+        '''
+        same signature as the casadi solver call used by do-mpc
+        '''
+        lbg = self._vec(lbg)[self.g_perm]
+        ubg = self._vec(ubg)[self.g_perm]
+        args = {
+            'x0': self._vec(x0)[self.x_perm],
+            'lbx': self._vec(lbx)[self.x_perm],
+            'ubx': self._vec(ubx)[self.x_perm],
+            # flip the bounds of the negated continuity constraints
+            'lbg': np.where(self.g_sign > 0, lbg, -ubg),
+            'ubg': np.where(self.g_sign > 0, ubg, -lbg),
+            'p': self._vec(p),
+        }
+        if lam_x0 is not None:
+            args['lam_x0'] = self._vec(lam_x0)[self.x_perm]
+        if lam_g0 is not None:
+            args['lam_g0'] = self._vec(lam_g0)[self.g_perm] * self.g_sign
+
+        res = self.solver(**args)
+
+        res['x'] = DM(self._vec(res['x'])[self.x_inv])
+        res['lam_x'] = DM(self._vec(res['lam_x'])[self.x_inv])
+        res['g'] = DM((self._vec(res['g']) * self.g_sign)[self.g_inv])
+        res['lam_g'] = DM((self._vec(res['lam_g']) * self.g_sign)[self.g_inv])
+
+        return res
+
+    def stats(self):
+        return self.solver.stats()
@@ -39,8 +39,66 @@ class MPC:
 
         self.current_control = np.zeros((self.nu * self.N))
 
-        # solver for QP problem
+        # solver for QP problem, set up once and only updated afterwards
         self.optimizer = osqp.OSQP()
+        self.optimizer_ready = False
+
+        # cost matrix is constant over the whole simulation
+        self.P = sparse.block_diag(
+            [
+                sparse.kron(sparse.eye(self.N), self.Q),
+                self.QN,
+                sparse.kron(sparse.eye(self.N), self.R),
+            ],
+            format="csc",
+        )
+
+        # constraint matrix with a fixed sparsity pattern
+        self.A_data, self.A_perm, self.A = self.init_constraint_pattern()
+
+    def init_constraint_pattern(self):
+        """
+        set up the sparsity pattern of the constraint matrix
+            [-I + A   B]  (equality part, LTV dynamics)
+            [    I     ]  (inequality part, state and input bounds)
+        OSQP can only update the values of the matrix, so the linearized
+        blocks A_lin and B_lin are stored densely, even if the linearization
+        is zero at some entries
+        """
+        nx, nu, N = self.nx, self.nu, self.N
+        n_x = nx * (N + 1)
+        n_var = n_x + nu * N
+
+        # -I of the equality part and identity of the inequality part
+        rows = [np.arange(n_x), n_x + np.arange(n_var)]
+        cols = [np.arange(n_x), np.arange(n_var)]
+        data = [-np.ones(n_x), np.ones(n_var)]
+
+        # A_lin and B_lin below the diagonal, filled at every time step
+        n, i, j = np.meshgrid(
+            np.arange(N), np.arange(nx), np.arange(nx), indexing="ij")
+        rows.append(((n + 1) * nx + i).ravel())
+        cols.append((n * nx + j).ravel())
+        n, i, j = np.meshgrid(
+            np.arange(N), np.arange(nx), np.arange(nu), indexing="ij")
+        rows.append(((n + 1) * nx + i).ravel())
+        cols.append((n_x + n * nu + j).ravel())
+        data += [np.zeros(N * nx * nx), np.zeros(N * nx * nu)]
+
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        data = np.concatenate(data)
+
+        # position of every entry in the data array of the CSC matrix
+        order = sparse.csc_matrix(
+            (np.arange(1, data.size + 1, dtype=float), (rows, cols)),
+            shape=(n_x + n_var, n_var),
+        )
+        perm = order.data.astype(int) - 1
+        A = sparse.csc_matrix(
+            (data[perm], order.indices, order.indptr), shape=order.shape)
+
+        return data, perm, A
 
     def init_problem(self):
 
@@ -52,8 +110,8 @@ class MPC:
 
         # LTV systems
         # huge matrices that consist of all matrices in a given horizon (N)
-        A = np.zeros((self.nx * (self.N + 1), self.nx * (self.N + 1)))
-        B = np.zeros((self.nx * (self.N + 1), self.nu * (self.N)))
+        A = np.zeros((self.N, self.nx, self.nx))
+        B = np.zeros((self.N, self.nx, self.nu))
 
         x_ref = np.zeros(self.nx * (self.N + 1))
         u_ref = np.zeros(self.nu * self.N)
@@ -63,7 +121,6 @@ class MPC:
 
         # dynamic state and input constraints
         xmin_dyn = np.kron(np.ones(self.N + 1), xmin)
-        print("xmin_dyn dimension ", xmin_dyn.shape)
         xmax_dyn = np.kron(np.ones(self.N + 1), xmax)
         umax_dyn = np.kron(np.ones(self.N), umax)
 
@@ -99,12 +156,8 @@ class MPC:
             # TODO: different model, different states
             A_lin, B_lin = self.model.linearize(v_ref, psi_ref, delta_ref)
 
-            A[
-                (n + 1) * self.nx: (n + 2) * self.nx, n * self.nx: (n + 1) * self.nx
-            ] = A_lin
-            B[
-                (n + 1) * self.nx: (n + 2) * self.nx, n * self.nu: (n + 1) * self.nu
-            ] = B_lin
+            A[n] = A_lin
+            B[n] = B_lin
 
             # TODO: 2 inputs have changed
             u_ref[n * self.nu: (n + 1) *
@@ -164,21 +217,14 @@ class MPC:
         # q: matrix for linear term    #
         ################################
 
-        P = sparse.block_diag(
-            [
-                sparse.kron(sparse.eye(self.N), self.Q),
-                self.QN,
-                sparse.kron(sparse.eye(self.N), self.R),
-            ],
-            format="csc",
-        )
+        # P is constant, see __init__
 
         # TODO: dunno how to construct
         q = np.hstack(
             [
-                -np.tile(np.diag(self.Q.A), self.N) * x_ref[: -self.nx],
+                -np.tile(self.Q.diagonal(), self.N) * x_ref[: -self.nx],
                 -self.QN.dot(x_ref[-self.nx:]),
-                -np.tile(np.diag(self.R.A), self.N) * u_ref,
+                -np.tile(self.R.diagonal(), self.N) * u_ref,
             ]
         )
 
@@ -186,18 +232,12 @@ class MPC:
         # A: system matrix in osqp form #
         #################################
 
-        # equality part
-        Ax = sparse.kron(
-            sparse.eye(self.N + 1), -sparse.eye(self.nx)
-        ) + sparse.csc_matrix(A)
-
-        Bu = sparse.csc_matrix(B)
-        A_eq = sparse.hstack([Ax, Bu])
-
-        # inequality matrix
-        A_ineq = sparse.eye((self.N + 1) * self.nx + self.N * self.nu)
-
-        A = sparse.vstack([A_eq, A_ineq], format="csc")
+        # only the values of the linearized blocks change, the sparsity
+        # pattern is fixed (see init_constraint_pattern)
+        n_fix = self.A_data.size - A.size - B.size
+        self.A_data[n_fix: n_fix + A.size] = A.ravel()
+        self.A_data[n_fix + A.size:] = B.ravel()
+        Ax = self.A_data[self.A_perm]
 
         #####################################
         # l, u: lower bound and upper bound #
@@ -220,8 +260,15 @@ class MPC:
         #       Solve the problem           #
         #####################################
 
-        self.optimizer = osqp.OSQP()
-        self.optimizer.setup(P=P, q=q, A=A, l=l, u=u, verbose=False)
+        # set up the solver once, afterwards only update the data so OSQP
+        # reuses the factorization structure and warm starts
+        if self.optimizer_ready:
+            self.optimizer.update(q=q, l=l, u=u, Ax=Ax)
+        else:
+            self.A.data = Ax
+            self.optimizer.setup(P=self.P, q=q, A=self.A,
+                                 l=l, u=u, verbose=False)
+            self.optimizer_ready = True
 
     def get_control(self):
 
@@ -268,20 +315,15 @@ class MPC:
 
     def update_prediction(self, state_prediction):
         """
-        output lists of coordinate x and y for visualization
+        output arrays of coordinate x and y for visualization
         """
-        x_pred, y_pred = [], []
-
-        for n in range(2, self.N):
-            matched_waypoint = self.model.reference_path.get_waypoint(
-                self.model.wp_id + n
-            )
+        reference_path = self.model.reference_path
 
-            # TODO since we don't need to tranform from spatial to temporal, need change
-            x_pred.append(matched_waypoint.x)
-            y_pred.append(matched_waypoint.y)
+        # TODO since we don't need to tranform from spatial to temporal, need change
+        wp_ids = reference_path.get_waypoint_ids(
+            self.model.wp_id + 2, self.N - 2)
 
-        return x_pred, y_pred
+        return reference_path.wp_x[wp_ids], reference_path.wp_y[wp_ids]
 
     def show_prediction(self):
         """
@@ -103,6 +103,16 @@ class ReferencePath:
         # Number of waypoints
         self.n_waypoints = len(self.waypoints)
 
+        # Waypoint coordinates, orientation and reference velocity as
+        # contiguous arrays for slicing over the prediction horizon
+        self.wp_x = np.ascontiguousarray(
+            [wp.x for wp in self.waypoints], dtype=np.float64)
+        self.wp_y = np.ascontiguousarray(
+            [wp.y for wp in self.waypoints], dtype=np.float64)
+        self.wp_psi = np.ascontiguousarray(
+            [wp.psi for wp in self.waypoints], dtype=np.float64)
+        self.wp_vref = np.zeros(self.n_waypoints)
+
         # Length of path
         self.length, self.segment_lengths = self._compute_length()
 
@@ -357,6 +367,8 @@ class ReferencePath:
         for i, wp in enumerate(self.waypoints[:-1]):
             wp.v_ref = speed_profile[i]
         self.waypoints[-1].v_ref = self.waypoints[-2].v_ref
+        self.wp_vref[:-1] = speed_profile
+        self.wp_vref[-1] = self.wp_vref[-2]
 
     def get_waypoint(self, wp_id):
         """
@@ -375,6 +387,27 @@ class ReferencePath:
 
         return self.waypoints[wp_id]
 
+    def get_waypoint_ids(self, wp_id, N):
+        """
+        Get the IDs of N consecutive waypoints starting at wp_id. Circular
+        indexing supported.
+        :param wp_id: unique waypoint ID of the first waypoint
+        :param N: number of waypoints
+        :return: array of waypoint IDs to index the waypoint arrays with
+        """
+
+        wp_ids = np.arange(wp_id, wp_id + N)
+
+        # Allow circular indexing if circular path
+        if self.circular:
+            wp_ids = np.mod(wp_ids, self.n_waypoints)
+        # Terminate execution if end of path reached
+        elif wp_ids[-1] >= self.n_waypoints:
+            print('Reached end of path!')
+            exit(1)
+
+        return wp_ids
+
     def show(self, display_drivable_area=True):
         """
         Display path object on current figure.